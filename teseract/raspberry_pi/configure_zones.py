@@ -4,10 +4,10 @@ Zone Configuration Tool
 Interactive tool to configure entry/exit zones and virtual line position
 """
 
-import cv2
 import numpy as np
 import sys
 import os
+import threading
 from typing import Optional, Tuple
 
 # Add parent directory to path for imports
@@ -15,19 +15,107 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config_manager import ConfigManager
 
+# OpenCV is bound on first ZoneConfigurator construction so that importing
+# this module does not load OpenCV's shared libraries
+cv2 = None
+
+
+def _import_cv():
+    """Import cv2 into the module namespace if not already loaded"""
+    global cv2
+    if cv2 is None:
+        import cv2 as _cv2
+        cv2 = _cv2
+
+
+class _CaptureThread(threading.Thread):
+    """Background thread that keeps the most recent camera frame"""
+    
+    def __init__(self, camera):
+        """
+        Initialize capture thread
+        
+        Args:
+            camera: Opened cv2.VideoCapture
+        """
+        super().__init__(daemon=True)
+        self.camera = camera
+        self.failed = False
+        self._latest = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+    
+    def run(self):
+        """Read frames until stopped or the camera fails"""
+        while not self._stop_event.is_set():
+            if not self._resume_event.is_set():
+                # Paused: keep the last frame and wake up periodically to check for stop
+                self._resume_event.wait(0.1)
+                continue
+            
+            ret, frame = self.camera.read()
+            if not ret:
+                self.failed = True
+                break
+            with self._lock:
+                self._latest = frame
+    
+    def latest(self):
+        """
+        Get the most recent frame
+        
+        Returns:
+            numpy.ndarray: Latest frame, or None if no frame has been read yet
+        """
+        with self._lock:
+            return self._latest
+    
+    def set_paused(self, paused):
+        """
+        Pause or resume reading frames
+        
+        Args:
+            paused: True to stop reading frames, False to resume
+        """
+        if paused:
+            self._resume_event.clear()
+        else:
+            self._resume_event.set()
+    
+    def stop(self):
+        """Stop the thread and wait for it to finish"""
+        self._stop_event.set()
+        self._resume_event.set()
+        self.join(timeout=1.0)
+
 
 class ZoneConfigurator:
     """Interactive zone configuration tool"""
     
-    def __init__(self, camera_index=0):
+    def __init__(self, camera_index=0, preview_width=640, frame_width=1280, frame_height=720):
         """
         Initialize zone configurator
         
         Args:
             camera_index: USB camera index
+            preview_width: Capture width used for the interactive preview
+            frame_width: Frame width used by the parking system at runtime
+            frame_height: Frame height used by the parking system at runtime
         """
+        _import_cv()
+        
         self.camera_index = camera_index
+        
+        # Zones are clicked on a low resolution preview and scaled to the
+        # runtime resolution when saved
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.preview_width = preview_width
+        self.preview_height = int(round(preview_width * frame_height / frame_width))
         self.camera = None
+        self._capture = None
         self.config_manager = ConfigManager()
         
         # Zone selection state
@@ -40,6 +128,36 @@ class ZoneConfigurator:
         self.mode = "entry"  # "entry", "exit", "entry_virtual_line", "exit_virtual_line"
         self.current_point = None
         
+        # Click handler for each selection mode
+        self._click_handlers = {
+            "entry": self._click_entry,
+            "exit": self._click_exit,
+            "entry_virtual_line": self._click_entry_line,
+            "exit_virtual_line": self._click_exit_line
+        }
+        
+        # Set on user input; once configured the preview is only redrawn when set
+        self._needs_repaint = True
+        
+        # Delay between redraws, matched to the camera frame rate in initialize_camera
+        self.frame_delay_ms = 33
+        
+        # Reusable display buffer (allocated when camera is initialized)
+        self._scratch = None
+        
+        # Composite through OpenCV's T-API when OpenCL is available (set in initialize_camera)
+        self.use_opencl = False
+        
+        # Cached drawing of zones/lines and the state it was built for
+        self._overlay = None
+        self._overlay_mask = None
+        self._overlay_umat = None
+        self._overlay_state = None
+        
+        # Pre-rendered instruction panels keyed by (mode, points clicked in that mode)
+        self._instr_cache = {}
+        self.instruction_alpha = 0.7
+        
         # Window name
         self.window_name = "Zone Configuration - Click to set zones"
         
@@ -51,8 +169,37 @@ class ZoneConfigurator:
                 raise Exception(f"Failed to open camera at index {self.camera_index}")
             
             # Set camera properties
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+            # Keep only the latest frame so the preview does not lag behind
+            self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.preview_width)
+            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.preview_height)
+            
+            # Cameras may answer with another mode (e.g. 640x480 for 640x360)
+            actual_w = int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH))
+            actual_h = int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            if actual_w and actual_h and not self._aspect_matches(actual_w, actual_h):
+                print(f"Warning: camera delivers {actual_w}x{actual_h} previews, which do not "
+                      f"match the {self.frame_width}x{self.frame_height} runtime aspect ratio; "
+                      f"zones cannot be saved")
+            
+            # Redraw once per camera frame instead of spinning
+            fps = self.camera.get(cv2.CAP_PROP_FPS)
+            if fps > 0:
+                self.frame_delay_ms = max(1, int(1000 / fps))
+            
+            # Allocate display buffer once; draw_zones reallocates if frame size differs
+            self._scratch = np.empty((self.preview_height, self.preview_width, 3), dtype=np.uint8)
+            
+            # Offload compositing to the GPU when OpenCV has an OpenCL device
+            cv2.ocl.setUseOpenCL(True)
+            self.use_opencl = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+            if self.use_opencl:
+                print("OpenCL available, compositing preview on the GPU")
+            
+            # Read frames in the background so the GUI loop never blocks on the camera
+            self._capture = _CaptureThread(self.camera)
+            self._capture.start()
             
             print("Camera initialized successfully")
             return True
@@ -71,39 +218,45 @@ class ZoneConfigurator:
             param: User data
         """
         if event == cv2.EVENT_LBUTTONDOWN:
-            if self.mode == "entry":
-                if len(self.entry_points) == 0:
-                    # First point (top-left)
-                    self.entry_points = [(x, y)]
-                    print(f"Entry zone - Point 1 (top-left): ({x}, {y})")
-                elif len(self.entry_points) == 1:
-                    # Second point (bottom-right)
-                    self.entry_points.append((x, y))
-                    print(f"Entry zone - Point 2 (bottom-right): ({x}, {y})")
-                    print("Entry zone configured! Press 'e' to configure exit zone.")
-            
-            elif self.mode == "exit":
-                if len(self.exit_points) == 0:
-                    # First point (top-left)
-                    self.exit_points = [(x, y)]
-                    print(f"Exit zone - Point 1 (top-left): ({x}, {y})")
-                elif len(self.exit_points) == 1:
-                    # Second point (bottom-right)
-                    self.exit_points.append((x, y))
-                    print(f"Exit zone - Point 2 (bottom-right): ({x}, {y})")
-                    print("Exit zone configured! Press 'v' to set entry virtual line.")
-            
-            elif self.mode == "entry_virtual_line":
-                # Set entry virtual line position (y coordinate)
-                self.entry_virtual_line_y = y
-                print(f"Entry virtual line set at y={y}")
-                print("Entry virtual line configured! Press 'x' to set exit virtual line.")
-            
-            elif self.mode == "exit_virtual_line":
-                # Set exit virtual line position (y coordinate)
-                self.exit_virtual_line_y = y
-                print(f"Exit virtual line set at y={y}")
-                print("Configuration complete! Press 's' to save.")
+            self._overlay_state = None
+            self._needs_repaint = True
+            self._click_handlers[self.mode](x, y)
+    
+    def _click_entry(self, x, y):
+        """Handle a click while configuring the entry zone"""
+        if len(self.entry_points) == 0:
+            # First point (top-left)
+            self.entry_points = [(x, y)]
+            print(f"Entry zone - Point 1 (top-left): ({x}, {y})")
+        elif len(self.entry_points) == 1:
+            # Second point (bottom-right)
+            self.entry_points.append((x, y))
+            print(f"Entry zone - Point 2 (bottom-right): ({x}, {y})")
+            print("Entry zone configured! Press 'e' to configure exit zone.")
+    
+    def _click_exit(self, x, y):
+        """Handle a click while configuring the exit zone"""
+        if len(self.exit_points) == 0:
+            # First point (top-left)
+            self.exit_points = [(x, y)]
+            print(f"Exit zone - Point 1 (top-left): ({x}, {y})")
+        elif len(self.exit_points) == 1:
+            # Second point (bottom-right)
+            self.exit_points.append((x, y))
+            print(f"Exit zone - Point 2 (bottom-right): ({x}, {y})")
+            print("Exit zone configured! Press 'v' to set entry virtual line.")
+    
+    def _click_entry_line(self, x, y):
+        """Handle a click while setting the entry virtual line (y coordinate)"""
+        self.entry_virtual_line_y = y
+        print(f"Entry virtual line set at y={y}")
+        print("Entry virtual line configured! Press 'x' to set exit virtual line.")
+    
+    def _click_exit_line(self, x, y):
+        """Handle a click while setting the exit virtual line (y coordinate)"""
+        self.exit_virtual_line_y = y
+        print(f"Exit virtual line set at y={y}")
+        print("Configuration complete! Press 's' to save.")
     
     def draw_zones(self, frame):
         """
@@ -113,91 +266,248 @@ class ZoneConfigurator:
             frame: Camera frame
         
         Returns:
-            numpy.ndarray: Frame with zones drawn
+            numpy.ndarray or cv2.UMat: Frame with zones drawn (a UMat when OpenCL
+                is used). This is a reused buffer that is overwritten by the next
+                call, so callers must not keep it.
+        """
+        # Rebuild the overlay only when the configuration state changes
+        state = (tuple(self.entry_points), tuple(self.exit_points),
+                 self.entry_virtual_line_y, self.exit_virtual_line_y, frame.shape)
+        if state != self._overlay_state:
+            self._build_overlay(frame.shape)
+            self._overlay_state = state
+        
+        tile = self._get_instruction_tile()
+        h = min(tile.shape[0], frame.shape[0])
+        w = min(tile.shape[1], frame.shape[1])
+        tile = tile[:h, :w]
+        alpha = self.instruction_alpha
+        
+        if self.use_opencl:
+            # Single upload of the frame; overlay is already on the device
+            display_frame = cv2.UMat(frame)
+            overlay, overlay_mask = self._overlay_umat
+            cv2.copyTo(overlay, overlay_mask, display_frame)
+            roi = cv2.UMat(display_frame, (0, h), (0, w))
+            cv2.addWeighted(tile, alpha, roi, 1.0 - alpha, 0, dst=roi)
+            return display_frame
+        
+        if self._scratch is None or self._scratch.shape != frame.shape:
+            self._scratch = np.empty_like(frame)
+        np.copyto(self._scratch, frame)
+        display_frame = self._scratch
+        
+        cv2.copyTo(self._overlay, self._overlay_mask, display_frame)
+        
+        # Blend the pre-rendered instruction panel into the top-left corner
+        roi = display_frame[:h, :w]
+        cv2.addWeighted(tile, alpha, roi, 1.0 - alpha, 0, dst=roi)
+        
+        return display_frame
+    
+    def _build_overlay(self, shape):
+        """
+        Render zones and virtual lines onto a blank overlay
+        
+        Args:
+            shape: Frame shape (height, width, channels)
+        """
+        canvas = np.zeros(shape, dtype=np.uint8)
+        self._render_overlay(canvas)
+        self._overlay = canvas
+        self._overlay_mask = canvas.any(axis=2).astype(np.uint8)
+        if self.use_opencl:
+            self._overlay_umat = (cv2.UMat(self._overlay), cv2.UMat(self._overlay_mask))
+    
+    def _render_overlay(self, canvas):
         """
-        display_frame = frame.copy()
+        Draw zones and virtual lines
         
-        # Draw entry zone
+        Zone outlines and virtual lines are collected per colour and drawn with
+        one cv2.polylines call per colour group; labels and markers follow.
+        
+        Args:
+            canvas: Image to draw on
+        """
+        rects = {}  # colour -> closed polygons
+        lines = {}  # colour -> open polylines
+        labels = []  # (text, origin, scale, colour, thickness)
+        
+        # Entry zone
         if len(self.entry_points) == 2:
             x1, y1 = self.entry_points[0]
             x2, y2 = self.entry_points[1]
-            cv2.rectangle(display_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            cv2.putText(display_frame, "ENTRY ZONE", (x1, y1 - 10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            rects.setdefault((0, 255, 0), []).append(self._rect_points(x1, y1, x2, y2))
+            labels.append(("ENTRY ZONE", (x1, y1 - 10), 0.7, (0, 255, 0), 2))
         elif len(self.entry_points) == 1:
             x, y = self.entry_points[0]
-            cv2.circle(display_frame, (x, y), 5, (0, 255, 0), -1)
-            cv2.putText(display_frame, "Click for bottom-right", (x + 10, y),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+            cv2.circle(canvas, (x, y), 5, (0, 255, 0), -1)
+            labels.append(("Click for bottom-right", (x + 10, y), 0.5, (0, 255, 0), 1))
         
-        # Draw exit zone
+        # Exit zone
         if len(self.exit_points) == 2:
             x1, y1 = self.exit_points[0]
             x2, y2 = self.exit_points[1]
-            cv2.rectangle(display_frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
-            cv2.putText(display_frame, "EXIT ZONE", (x1, y1 - 10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+            rects.setdefault((0, 0, 255), []).append(self._rect_points(x1, y1, x2, y2))
+            labels.append(("EXIT ZONE", (x1, y1 - 10), 0.7, (0, 0, 255), 2))
         elif len(self.exit_points) == 1:
             x, y = self.exit_points[0]
-            cv2.circle(display_frame, (x, y), 5, (0, 0, 255), -1)
-            cv2.putText(display_frame, "Click for bottom-right", (x + 10, y),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-        
-        # Draw entry virtual line
-        if self.entry_virtual_line_y is not None:
-            h, w = display_frame.shape[:2]
-            # Only draw in entry zone if zone is configured
-            if len(self.entry_points) == 2:
-                x1, y1 = self.entry_points[0]
-                x2, y2 = self.entry_points[1]
-                x_min = min(x1, x2)
-                x_max = max(x1, x2)
-                cv2.line(display_frame, (x_min, self.entry_virtual_line_y), 
-                        (x_max, self.entry_virtual_line_y), (255, 255, 0), 2)
-                cv2.putText(display_frame, "ENTRY VIRTUAL LINE", (x_min + 10, self.entry_virtual_line_y - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-        
-        # Draw exit virtual line
-        if self.exit_virtual_line_y is not None:
-            h, w = display_frame.shape[:2]
-            # Only draw in exit zone if zone is configured
-            if len(self.exit_points) == 2:
-                x1, y1 = self.exit_points[0]
-                x2, y2 = self.exit_points[1]
-                x_min = min(x1, x2)
-                x_max = max(x1, x2)
-                cv2.line(display_frame, (x_min, self.exit_virtual_line_y), 
-                        (x_max, self.exit_virtual_line_y), (255, 165, 0), 2)
-                cv2.putText(display_frame, "EXIT VIRTUAL LINE", (x_min + 10, self.exit_virtual_line_y - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 165, 0), 2)
-        
-        # Draw instructions
+            cv2.circle(canvas, (x, y), 5, (0, 0, 255), -1)
+            labels.append(("Click for bottom-right", (x + 10, y), 0.5, (0, 0, 255), 1))
+        
+        # Entry virtual line (only drawn in entry zone if zone is configured)
+        if self.entry_virtual_line_y is not None and len(self.entry_points) == 2:
+            x_min = min(self.entry_points[0][0], self.entry_points[1][0])
+            x_max = max(self.entry_points[0][0], self.entry_points[1][0])
+            y = self.entry_virtual_line_y
+            lines.setdefault((255, 255, 0), []).append(np.array([[x_min, y], [x_max, y]], dtype=np.int32))
+            labels.append(("ENTRY VIRTUAL LINE", (x_min + 10, y - 10), 0.6, (255, 255, 0), 2))
+        
+        # Exit virtual line (only drawn in exit zone if zone is configured)
+        if self.exit_virtual_line_y is not None and len(self.exit_points) == 2:
+            x_min = min(self.exit_points[0][0], self.exit_points[1][0])
+            x_max = max(self.exit_points[0][0], self.exit_points[1][0])
+            y = self.exit_virtual_line_y
+            lines.setdefault((255, 165, 0), []).append(np.array([[x_min, y], [x_max, y]], dtype=np.int32))
+            labels.append(("EXIT VIRTUAL LINE", (x_min + 10, y - 10), 0.6, (255, 165, 0), 2))
+        
+        for color, polys in rects.items():
+            cv2.polylines(canvas, polys, True, color, 2)
+        for color, polys in lines.items():
+            cv2.polylines(canvas, polys, False, color, 2)
+        
+        for text, origin, scale, color, thickness in labels:
+            cv2.putText(canvas, text, origin, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+    
+    @staticmethod
+    def _rect_points(x1, y1, x2, y2):
+        """
+        Get the corners of a rectangle as a closed polygon
+        
+        Args:
+            x1, y1: First corner
+            x2, y2: Opposite corner
+        
+        Returns:
+            numpy.ndarray: int32 array of shape (4, 2)
+        """
+        return np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=np.int32)
+    
+    def _get_instructions(self, mode, points):
+        """
+        Get instruction lines for a mode
+        
+        Args:
+            mode: Selection mode
+            points: Number of points clicked for the zone being configured
+        
+        Returns:
+            list: Instruction strings
+        """
         instructions = []
-        if self.mode == "entry":
-            if len(self.entry_points) == 0:
+        if mode == "entry":
+            if points == 0:
                 instructions.append("Mode: ENTRY ZONE - Click top-left corner")
-            elif len(self.entry_points) == 1:
+            elif points == 1:
                 instructions.append("Mode: ENTRY ZONE - Click bottom-right corner")
-        elif self.mode == "exit":
-            if len(self.exit_points) == 0:
+        elif mode == "exit":
+            if points == 0:
                 instructions.append("Mode: EXIT ZONE - Click top-left corner")
-            elif len(self.exit_points) == 1:
+            elif points == 1:
                 instructions.append("Mode: EXIT ZONE - Click bottom-right corner")
-        elif self.mode == "entry_virtual_line":
+        elif mode == "entry_virtual_line":
             instructions.append("Mode: ENTRY VIRTUAL LINE - Click to set line position")
-        elif self.mode == "exit_virtual_line":
+        elif mode == "exit_virtual_line":
             instructions.append("Mode: EXIT VIRTUAL LINE - Click to set line position")
         
         instructions.append("Press 'e' for exit zone, 'v' for entry virtual line, 'x' for exit virtual line")
         instructions.append("Press 's' to save, 'q' to quit")
         instructions.append("Press 'r' to reset current zone")
         
-        y_offset = 30
+        return instructions
+    
+    def _instruction_key(self):
+        """
+        Get the state the instruction text depends on
+        
+        Returns:
+            tuple: (mode, points clicked for the zone being configured)
+        """
+        if self.mode == "entry":
+            return (self.mode, len(self.entry_points))
+        if self.mode == "exit":
+            return (self.mode, len(self.exit_points))
+        return (self.mode, 0)
+    
+    def _render_instruction_tile(self, mode, points):
+        """
+        Render the instruction panel for a state
+        
+        Args:
+            mode: Selection mode
+            points: Number of points clicked for the zone being configured
+        
+        Returns:
+            numpy.ndarray: Panel image with white text on black
+        """
+        instructions = self._get_instructions(mode, points)
+        
+        # Size the panel to fit the widest line, shrinking text for narrow previews
+        scale = 0.6
+        width = max(cv2.getTextSize(instruction, cv2.FONT_HERSHEY_SIMPLEX, scale, 2)[0][0]
+                    for instruction in instructions)
+        if width + 20 > self.preview_width:
+            scale *= (self.preview_width - 20) / width
+            width = max(cv2.getTextSize(instruction, cv2.FONT_HERSHEY_SIMPLEX, scale, 2)[0][0]
+                        for instruction in instructions)
+        line_height = int(round(25 * scale / 0.6))
+        y_offset = int(round(30 * scale / 0.6))
+        height = y_offset + (len(instructions) - 1) * line_height + 10
+        
+        canvas = np.zeros((height, width + 20, 3), dtype=np.uint8)
         for i, instruction in enumerate(instructions):
-            cv2.putText(display_frame, instruction, (10, y_offset + i * 25),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            cv2.putText(canvas, instruction, (10, y_offset + i * line_height),
+                       cv2.FONT_HERSHEY_SIMPLEX, scale, (255, 255, 255), 2)
         
-        return display_frame
+        return canvas
+    
+    def _prerender_instruction_tiles(self):
+        """Render the instruction panel for every reachable state"""
+        for mode in ("entry", "exit"):
+            for points in range(3):
+                self._instr_cache[(mode, points)] = self._render_instruction_tile(mode, points)
+        for mode in ("entry_virtual_line", "exit_virtual_line"):
+            self._instr_cache[(mode, 0)] = self._render_instruction_tile(mode, 0)
+    
+    def _get_instruction_tile(self):
+        """
+        Get the pre-rendered instruction panel for the current state
+        
+        Returns:
+            numpy.ndarray: Panel image
+        """
+        key = self._instruction_key()
+        tile = self._instr_cache.get(key)
+        if tile is None:
+            tile = self._render_instruction_tile(*key)
+            self._instr_cache[key] = tile
+        
+        return tile
+    
+    def _aspect_matches(self, width: int, height: int, tolerance: float = 0.01) -> bool:
+        """
+        Check whether a frame size has the runtime frame's aspect ratio
+        
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+            tolerance: Allowed relative difference between the ratios
+        
+        Returns:
+            bool: True if the aspect ratios match within tolerance
+        """
+        runtime_ratio = self.frame_width / self.frame_height
+        return abs(width / height - runtime_ratio) <= tolerance * runtime_ratio
     
     def save_configuration(self) -> bool:
         """
@@ -215,13 +525,30 @@ class ZoneConfigurator:
             return False
         
         # Get frame dimensions
-        ret, frame = self.camera.read()
-        if not ret:
+        frame = self._capture.latest()
+        if frame is None:
             print("Error: Could not read frame to get dimensions")
             return False
         
         h, w = frame.shape[:2]
         
+        # Per-axis scaling is only valid when the preview shows the runtime field of view
+        if not self._aspect_matches(w, h):
+            print(f"Error: Preview is {w}x{h} but the runtime frame is "
+                  f"{self.frame_width}x{self.frame_height}; aspect ratios differ, so the "
+                  f"zones would be stretched. Use a preview size with the runtime aspect ratio")
+            return False
+        
+        # Scale factors from preview pixels to runtime frame pixels
+        scale = np.array([self.frame_width / w, self.frame_height / h])
+        sy = scale[1]
+        
+        # Corner-wise min/max of the two clicked points, scaled to runtime pixels
+        entry = np.array(self.entry_points)
+        exit_ = np.array(self.exit_points)
+        e_lo, e_hi = np.rint(entry.min(axis=0) * scale), np.rint(entry.max(axis=0) * scale)
+        x_lo, x_hi = np.rint(exit_.min(axis=0) * scale), np.rint(exit_.max(axis=0) * scale)
+        
         # Calculate virtual line positions as ratios
         entry_virtual_line_ratio = self.entry_virtual_line_y / h
         exit_virtual_line_ratio = self.exit_virtual_line_y / h
@@ -229,21 +556,21 @@ class ZoneConfigurator:
         # Create configuration
         config = {
             "entry_zone": {
-                "x1": min(self.entry_points[0][0], self.entry_points[1][0]),
-                "y1": min(self.entry_points[0][1], self.entry_points[1][1]),
-                "x2": max(self.entry_points[0][0], self.entry_points[1][0]),
-                "y2": max(self.entry_points[0][1], self.entry_points[1][1])
+                "x1": int(e_lo[0]),
+                "y1": int(e_lo[1]),
+                "x2": int(e_hi[0]),
+                "y2": int(e_hi[1])
             },
             "exit_zone": {
-                "x1": min(self.exit_points[0][0], self.exit_points[1][0]),
-                "y1": min(self.exit_points[0][1], self.exit_points[1][1]),
-                "x2": max(self.exit_points[0][0], self.exit_points[1][0]),
-                "y2": max(self.exit_points[0][1], self.exit_points[1][1])
+                "x1": int(x_lo[0]),
+                "y1": int(x_lo[1]),
+                "x2": int(x_hi[0]),
+                "y2": int(x_hi[1])
             },
             "entry_virtual_line_position": entry_virtual_line_ratio,
             "exit_virtual_line_position": exit_virtual_line_ratio,
-            "frame_width": w,
-            "frame_height": h,
+            "frame_width": self.frame_width,
+            "frame_height": self.frame_height,
             "motion_threshold": 500
         }
         
@@ -252,8 +579,8 @@ class ZoneConfigurator:
             print("Configuration saved successfully!")
             print(f"Entry zone: ({config['entry_zone']['x1']}, {config['entry_zone']['y1']}) to ({config['entry_zone']['x2']}, {config['entry_zone']['y2']})")
             print(f"Exit zone: ({config['exit_zone']['x1']}, {config['exit_zone']['y1']}) to ({config['exit_zone']['x2']}, {config['exit_zone']['y2']})")
-            print(f"Entry virtual line position: {entry_virtual_line_ratio:.2f} ({self.entry_virtual_line_y} pixels)")
-            print(f"Exit virtual line position: {exit_virtual_line_ratio:.2f} ({self.exit_virtual_line_y} pixels)")
+            print(f"Entry virtual line position: {entry_virtual_line_ratio:.2f} ({int(round(self.entry_virtual_line_y * sy))} pixels)")
+            print(f"Exit virtual line position: {exit_virtual_line_ratio:.2f} ({int(round(self.exit_virtual_line_y * sy))} pixels)")
             return True
         else:
             print("Error: Failed to save configuration")
@@ -261,6 +588,8 @@ class ZoneConfigurator:
     
     def reset_current_zone(self):
         """Reset current zone selection"""
+        self._overlay_state = None
+        
         if self.mode == "entry":
             self.entry_points = []
             print("Entry zone reset")
@@ -279,6 +608,9 @@ class ZoneConfigurator:
         if not self.initialize_camera():
             return False
         
+        # Render instruction panels up front so no text is drawn per frame
+        self._prerender_instruction_tiles()
+        
         # Create window and set mouse callback
         cv2.namedWindow(self.window_name)
         cv2.setMouseCallback(self.window_name, self.mouse_callback)
@@ -301,19 +633,34 @@ class ZoneConfigurator:
         
         try:
             while True:
-                ret, frame = self.camera.read()
-                if not ret:
+                if self._capture.failed:
                     print("Error: Failed to read frame")
                     break
                 
-                # Draw zones on frame
-                display_frame = self.draw_zones(frame)
+                # Once everything is configured nothing changes until the next
+                # click or key press, so stop capturing and redraw the last frame
+                # only on input
+                idle = self.exit_virtual_line_y is not None
+                self._capture.set_paused(idle)
                 
-                # Show frame
-                cv2.imshow(self.window_name, display_frame)
+                if not idle or self._needs_repaint:
+                    frame = self._capture.latest()
+                    if frame is None:
+                        # No frame captured yet
+                        cv2.waitKey(self.frame_delay_ms)
+                        continue
+                    
+                    # Draw zones on frame
+                    display_frame = self.draw_zones(frame)
+                    
+                    # Show frame
+                    cv2.imshow(self.window_name, display_frame)
+                    self._needs_repaint = False
                 
                 # Handle keyboard input
-                key = cv2.waitKey(1) & 0xFF
+                key = cv2.waitKey(self.frame_delay_ms) & 0xFF
+                if key != 0xFF:
+                    self._needs_repaint = True
                 
                 if key == ord('q'):
                     print("Quitting without saving...")
@@ -348,6 +695,7 @@ class ZoneConfigurator:
             print("\nInterrupted by user")
         finally:
             # Cleanup
+            self._capture.stop()
             self.camera.release()
             cv2.destroyAllWindows()
             print("Configuration tool closed")
@@ -362,10 +710,19 @@ def main():
     parser = argparse.ArgumentParser(description='Zone Configuration Tool')
     parser.add_argument('--camera', type=int, default=0,
                         help='Camera index (default: 0)')
+    parser.add_argument('--preview-width', type=int, default=640,
+                        help='Preview capture width (default: 640)')
+    parser.add_argument('--frame-width', type=int, default=1280,
+                        help='Runtime frame width the zones are saved for (default: 1280)')
+    parser.add_argument('--frame-height', type=int, default=720,
+                        help='Runtime frame height the zones are saved for (default: 720)')
     
     args = parser.parse_args()
     
-    configurator = ZoneConfigurator(camera_index=args.camera)
+    configurator = ZoneConfigurator(camera_index=args.camera,
+                                    preview_width=args.preview_width,
+                                    frame_width=args.frame_width,
+                                    frame_height=args.frame_height)
     configurator.run()
 
 
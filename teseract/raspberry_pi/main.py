@@ -6,9 +6,11 @@ Main event loop with virtual line detection coordinating all components
 
 import sys
 import os
+import sched
 import time
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
@@ -54,7 +56,8 @@ class ParkingSystem:
         # Initialize components
         logger.info("Initializing parking system components...")
         
-        self.serial_comm = SerialCommunicator(port=serial_port)
+        # Short read timeout so the main loop notices shutdown promptly
+        self.serial_comm = SerialCommunicator(port=serial_port, timeout=0.5)
         self.camera_handler = CameraHandler(
             camera_index=camera_index,
             use_config=use_config
@@ -71,6 +74,15 @@ class ParkingSystem:
         # Lock for thread-safe operations
         self.processing_lock = threading.Lock()
         
+        # Background writer for exit records so the gate opens without waiting on disk
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        
+        # Single thread that runs delayed actions such as closing gates
+        self._sched_wake = threading.Event()
+        self._sched_stop = threading.Event()
+        self._sched = sched.scheduler(time.monotonic, self._sched_delay)
+        self._sched_thread = None
+        
         logger.info("Parking system initialized")
     
     def start(self):
@@ -87,6 +99,10 @@ class ParkingSystem:
             logger.error("Failed to initialize camera. Please check camera connection.")
             return False
         
+        # Start the scheduler for delayed gate actions
+        self._sched_thread = threading.Thread(target=self._run_scheduler, daemon=True)
+        self._sched_thread.start()
+        
         # Start camera processing with virtual line detection callbacks
         if not self.camera_handler.start_processing(
             entry_callback=self._handle_entry_virtual_line,
@@ -115,33 +131,71 @@ class ParkingSystem:
         logger.info("Stopping parking system...")
         self.running = False
         
-        # Stop camera processing
-        self.camera_handler.stop_processing()
+        # Stop camera processing and let in-flight crossing callbacks finish,
+        # since they may still open a gate
+        self.camera_handler.release_camera()
         
-        # Close gates
-        close_entry_gate(self.serial_comm)
-        close_exit_gate(self.serial_comm)
-        buzzer_off(self.serial_comm)
+        # Close gates and silence buzzer in one write
+        self.serial_comm.send_commands(["CLOSE_ENTRY_GATE", "CLOSE_EXIT_GATE", "BUZZER_OFF"])
         
         # Release resources
-        self.camera_handler.release_camera()
         self.serial_comm.disconnect()
+        self._stop_scheduler()
+        self._executor.shutdown(wait=True)
+        self.data_manager.close()
         
         logger.info("Parking system stopped")
     
+    def _schedule(self, delay: float, action):
+        """
+        Run an action after a delay on the scheduler thread
+        
+        Args:
+            delay: Delay in seconds
+            action: Callable to run
+        """
+        self._sched.enter(delay, 1, action)
+        self._sched_wake.set()
+    
+    def _sched_delay(self, timeout: float):
+        """Scheduler delay function that returns early when an event is added"""
+        self._sched_wake.wait(timeout)
+        self._sched_wake.clear()
+    
+    def _run_scheduler(self):
+        """Run scheduled actions until the system stops"""
+        while not self._sched_stop.is_set():
+            try:
+                self._sched.run()
+            except Exception as e:
+                logger.error(f"Scheduled action failed: {e}", exc_info=True)
+                continue
+            
+            # Idle until an action is scheduled or the system stops
+            self._sched_wake.wait()
+            self._sched_wake.clear()
+    
+    def _stop_scheduler(self):
+        """Stop the scheduler thread, dropping pending actions"""
+        self._sched_stop.set()
+        for event in self._sched.queue:
+            try:
+                self._sched.cancel(event)
+            except ValueError:
+                pass  # Already run
+        self._sched_wake.set()
+        if self._sched_thread is not None:
+            self._sched_thread.join(timeout=1.0)
+    
     def _main_loop(self):
         """Main event processing loop"""
         logger.info("Entering main event loop...")
         
         while self.running:
-            # Read messages from ESP32 (parking slot status)
-            messages = self.serial_comm.read_all_messages()
-            
-            for message in messages:
+            # Wait for the next message from ESP32 (parking slot status)
+            message = self.serial_comm.read_message_blocking()
+            if message:
                 self._handle_message(message)
-            
-            # Small delay to prevent excessive CPU usage
-            time.sleep(0.1)
     
     def _handle_message(self, message: str):
         """
@@ -181,11 +235,8 @@ class ParkingSystem:
         if self.data_manager.is_parking_full(self.total_slots) or self.slot_occupied:
             logger.warning("Parking is full! Activating buzzer...")
             buzzer_on(self.serial_comm)
-            # Turn off buzzer after 3 seconds
-            time.sleep(3)
-            buzzer_off(self.serial_comm)
-            with self.processing_lock:
-                self.entry_gate_processing = False
+            # Turn off buzzer after 3 seconds without blocking the callback thread
+            self._schedule(3.0, self._buzzer_off_after_timeout)
             return
         
         # Extract number plate from entry zone
@@ -234,12 +285,18 @@ class ParkingSystem:
             
             # Close gate after timeout (vehicle should pass through)
             # In a real system, you might want to detect when vehicle passes
-            threading.Timer(5.0, self._close_entry_gate_after_timeout).start()
+            self._schedule(5.0, self._close_entry_gate_after_timeout)
         else:
             logger.error("Failed to add vehicle entry record")
             with self.processing_lock:
                 self.entry_gate_processing = False
     
+    def _buzzer_off_after_timeout(self):
+        """Turn off the parking-full buzzer and accept entry triggers again"""
+        buzzer_off(self.serial_comm)
+        with self.processing_lock:
+            self.entry_gate_processing = False
+    
     def _close_entry_gate_after_timeout(self):
         """Close entry gate after timeout"""
         with self.processing_lock:
@@ -291,6 +348,12 @@ class ParkingSystem:
                 self.exit_gate_processing = False
             return
         
+        # Open exit gate as soon as the vehicle is known
+        open_exit_gate(self.serial_comm)
+        
+        # Close gate after timeout
+        self._schedule(5.0, self._close_exit_gate_after_timeout)
+        
         # Calculate fee
         entry_time = vehicle_entry["entry_time"]
         exit_time = datetime.now()
@@ -310,20 +373,30 @@ class ParkingSystem:
         print(f"Fee: {self.fee_calculator.format_fee(fee)}")
         print(f"{'='*50}\n")
         
-        # Add to history
-        slot = vehicle_entry["slot"]
-        self.data_manager.add_history_record(number_plate, entry_time, exit_time, fee, slot)
+        # Move vehicle from active records to history in the background
+        try:
+            self._executor.submit(self._record_exit, number_plate, entry_time, exit_time,
+                                  fee, vehicle_entry["slot"])
+        except RuntimeError:
+            # Executor already shut down; record synchronously so the exit is not lost
+            self._record_exit(number_plate, entry_time, exit_time, fee, vehicle_entry["slot"])
+    
+    def _record_exit(self, number_plate: str, entry_time: datetime, exit_time: datetime,
+                     fee: float, slot: int):
+        """
+        Add history record and remove vehicle from active records
         
-        # Remove from active vehicles
+        Args:
+            number_plate: Vehicle number plate
+            entry_time: Entry timestamp
+            exit_time: Exit timestamp
+            fee: Parking fee charged
+            slot: Parking slot number
+        """
+        self.data_manager.add_history_record(number_plate, entry_time, exit_time, fee, slot)
         self.data_manager.remove_vehicle_entry(number_plate)
         
         logger.info(f"Vehicle {number_plate} removed from active records")
-        
-        # Open exit gate
-        open_exit_gate(self.serial_comm)
-        
-        # Close gate after timeout
-        threading.Timer(5.0, self._close_exit_gate_after_timeout).start()
     
     def _close_exit_gate_after_timeout(self):
         """Close exit gate after timeout"""
@@ -10,6 +10,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Port description substrings (upper-case) that identify an ESP32 USB bridge
+ESP32_IDENTS = ('ESP32', 'CH340', 'CP210', 'FTDI', 'USB SERIAL')
+
 
 class SerialCommunicator:
     """Handles serial communication with ESP32"""
@@ -29,6 +32,11 @@ class SerialCommunicator:
         self.timeout = timeout
         self.serial_connection = None
         self.is_connected = False
+        # Connected and port open; cached so per-command checks skip the is_open property
+        self._open = False
+        
+        # Bytes of an incomplete line left over from the last read
+        self._rx_residual = b""
         
     def connect(self):
         """Establish serial connection with ESP32"""
@@ -53,25 +61,35 @@ class SerialCommunicator:
             # Clear any existing data in buffer
             self.serial_connection.reset_input_buffer()
             self.serial_connection.reset_output_buffer()
+            self._rx_residual = b""
             
             self.is_connected = True
+            self._open = True
             logger.info(f"Serial connection established on {self.port} at {self.baud_rate} baud")
             return True
             
         except serial.SerialException as e:
             logger.error(f"Serial connection error: {e}")
             self.is_connected = False
+            self._open = False
             return False
         except Exception as e:
             logger.error(f"Unexpected error during connection: {e}")
             self.is_connected = False
+            self._open = False
             return False
     
     def disconnect(self):
         """Close serial connection"""
         if self.serial_connection and self.serial_connection.is_open:
+            # Wait for queued commands to go out before closing
+            try:
+                self.serial_connection.flush()
+            except serial.SerialException as e:
+                logger.warning(f"Serial flush error: {e}")
             self.serial_connection.close()
             self.is_connected = False
+            self._open = False
             logger.info("Serial connection closed")
     
     def _auto_detect_port(self):
@@ -81,15 +99,11 @@ class SerialCommunicator:
         """
         ports = serial.tools.list_ports.comports()
         
-        # Common ESP32 identifiers
-        esp32_identifiers = ['ESP32', 'CH340', 'CP210', 'FTDI', 'USB Serial']
-        
         for port in ports:
             port_description = port.description.upper()
-            for identifier in esp32_identifiers:
-                if identifier.upper() in port_description:
-                    logger.info(f"Auto-detected ESP32 on port: {port.device}")
-                    return port.device
+            if any(ident in port_description for ident in ESP32_IDENTS):
+                logger.info(f"Auto-detected ESP32 on port: {port.device}")
+                return port.device
         
         # If no match found, try common port names
         common_ports = ['/dev/ttyUSB0', '/dev/ttyACM0', '/dev/ttyUSB1', '/dev/ttyACM1']
@@ -114,16 +128,28 @@ class SerialCommunicator:
         Returns:
             bool: True if command sent successfully, False otherwise
         """
-        if not self.is_connected or not self.serial_connection.is_open:
+        return self.send_commands([command])
+    
+    def send_commands(self, commands):
+        """
+        Send several commands to ESP32 in a single write
+        
+        Args:
+            commands: List of command strings
+        
+        Returns:
+            bool: True if commands sent successfully, False otherwise
+        """
+        if not self._open:
             logger.warning("Serial connection not established. Attempting to reconnect...")
             if not self.connect():
                 return False
         
         try:
-            command_with_newline = command + '\n'
-            self.serial_connection.write(command_with_newline.encode('utf-8'))
-            self.serial_connection.flush()
-            logger.debug(f"Sent command: {command}")
+            # Written without flush; the OS sends the bytes without blocking the caller
+            payload = "".join(command + '\n' for command in commands)
+            self.serial_connection.write(payload.encode('utf-8'))
+            logger.debug(f"Sent commands: {', '.join(commands)}")
             return True
         except serial.SerialTimeoutException:
             logger.error("Serial write timeout")
@@ -131,6 +157,7 @@ class SerialCommunicator:
         except serial.SerialException as e:
             logger.error(f"Serial write error: {e}")
             self.is_connected = False
+            self._open = False
             return False
     
     def read_message(self):
@@ -140,18 +167,56 @@ class SerialCommunicator:
         Returns:
             str: Message received from ESP32, or None if no message available
         """
-        if not self.is_connected or not self.serial_connection.is_open:
+        if not self._open:
             return None
         
         try:
             if self.serial_connection.in_waiting > 0:
-                message = self.serial_connection.readline().decode('utf-8').strip()
+                line = self._take_residual(self.serial_connection.readline())
+                if not line.endswith(b"\n"):
+                    # Timed out mid-line; keep the fragment for the next read
+                    self._rx_residual = line
+                    return None
+                message = line.decode('utf-8').strip()
                 if message:
                     logger.debug(f"Received message: {message}")
                     return message
         except serial.SerialException as e:
             logger.error(f"Serial read error: {e}")
             self.is_connected = False
+            self._open = False
+        except UnicodeDecodeError:
+            logger.warning("Failed to decode serial message")
+        
+        return None
+    
+    def read_message_blocking(self):
+        """
+        Wait for a message from ESP32, up to the read timeout
+        
+        Returns:
+            str: Message received from ESP32, or None if the timeout elapsed
+        """
+        if not self.is_available():
+            # Nothing to wait on; sleep so callers polling in a loop do not spin
+            time.sleep(self.timeout)
+            return None
+        
+        try:
+            # readline blocks until a newline arrives or the timeout elapses
+            line = self._take_residual(self.serial_connection.readline())
+            if not line.endswith(b"\n"):
+                # Timed out mid-line; keep the fragment for the next read
+                self._rx_residual = line
+                return None
+            message = line.decode('utf-8').strip()
+            if message:
+                logger.debug(f"Received message: {message}")
+                return message
+        except serial.SerialException as e:
+            logger.error(f"Serial read error: {e}")
+            self.is_connected = False
+            self._open = False
         except UnicodeDecodeError:
             logger.warning("Failed to decode serial message")
         
@@ -164,17 +229,51 @@ class SerialCommunicator:
         Returns:
             list: List of messages received
         """
+        if not self.is_available():
+            return []
+        
+        try:
+            # Drain everything buffered with a single read
+            waiting = self.serial_connection.in_waiting
+            if not waiting:
+                return []
+            data = self._rx_residual + self.serial_connection.read(waiting)
+        except serial.SerialException as e:
+            logger.error(f"Serial read error: {e}")
+            self.is_connected = False
+            self._open = False
+            return []
+        
+        # Keep an incomplete trailing line for the next call
+        lines = data.split(b"\n")
+        self._rx_residual = lines.pop()
+        
         messages = []
-        while True:
-            message = self.read_message()
-            if message is None:
-                break
-            messages.append(message)
+        for line in lines:
+            message = line.decode('utf-8', 'replace').strip()
+            if message:
+                logger.debug(f"Received message: {message}")
+                messages.append(message)
         return messages
     
+    def _take_residual(self, line):
+        """
+        Prepend any incomplete line left by read_all_messages
+        
+        Args:
+            line: Bytes just read
+        
+        Returns:
+            bytes: Residual bytes followed by line
+        """
+        if self._rx_residual:
+            line = self._rx_residual + line
+            self._rx_residual = b""
+        return line
+    
     def is_available(self):
         """Check if serial connection is available"""
-        return self.is_connected and self.serial_connection is not None and self.serial_connection.is_open
+        return self._open
     
     def reconnect(self):
         """Attempt to reconnect to ESP32"""
@@ -6,9 +6,12 @@ Handles single camera with frame splitting, virtual line detection, and number p
 import cv2
 import numpy as np
 import logging
+import string
 import threading
+import queue
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple, Callable
 from enum import Enum
 from google.cloud import vision
@@ -27,6 +30,16 @@ class Zone(Enum):
 class CameraHandler:
     """Handles camera operations with frame splitting and virtual line detection"""
     
+    # Translation table deleting every ASCII character that cannot appear on a plate
+    _PLATE_CHARS = frozenset(string.ascii_uppercase + string.digits)
+    _PLATE_DELETE_TABLE = str.maketrans('', '', ''.join(
+        sorted(frozenset(map(chr, range(128))) - _PLATE_CHARS)
+    ))
+    
+    # OCR preprocessing blur and morphology kernels
+    _GAUSS_KERNEL_SIZE = (5, 5)
+    _MORPH_KERNEL = np.ones((2, 2), np.uint8)
+    
     def __init__(self, camera_index=0, use_config=True, credentials_path=None):
         """
         Initialize camera handler
@@ -63,9 +76,11 @@ class CameraHandler:
             self.frame_width = 1280
             self.frame_height = 720
         
+        self._precompute_zone_geometry()
+        
         self.camera = None
         self.background_subtractor = cv2.createBackgroundSubtractorMOG2(
-            history=500, varThreshold=50, detectShadows=True
+            history=500, varThreshold=50, detectShadows=False
         )
     
     def _init_vision_client(self, credentials_path=None):
@@ -100,6 +115,34 @@ class CameraHandler:
             logger.error(f"Failed to initialize Google Cloud Vision client: {e}")
             self.vision_client = None
         
+        self.background_learning_frames = 60  # ~2 seconds at 30fps
+        self.background_learning_rate = 1.0 / 30.0
+        
+        # Run background subtraction on the GPU when OpenCV is built with CUDA (e.g. Jetson)
+        self.use_cuda = self._cuda_available()
+        if self.use_cuda:
+            self.bg_sub_gpu = cv2.cuda.createBackgroundSubtractorMOG2(
+                history=500, varThreshold=50, detectShadows=False
+            )
+            self.gpu_frame = cv2.cuda_GpuMat()
+            self.gpu_mask = cv2.cuda_GpuMat()
+            self.stream = cv2.cuda_Stream()
+            logger.info("CUDA device found, background subtraction will run on GPU")
+        
+        # Background subtraction runs on a downsampled frame (updated when camera is initialized)
+        self.proc_width = 640
+        self.proc_height = 360
+        self.scale_x = self.frame_width / self.proc_width
+        self.scale_y = self.frame_height / self.proc_height
+        
+        # Frame-difference gate used to skip background subtraction on idle frames
+        self.prev_gray_small = None
+        self._foreground_active = False  # Last processed mask still had vehicle-sized foreground
+        self.motion_gate_size = (160, 90)
+        self.motion_gate_diff_threshold = 15  # Per-pixel intensity change
+        self.motion_gate_min_pixels = 50  # Changed pixels required to count as motion
+        self.idle_learning_interval = 10  # Still update background every Nth idle frame
+        
         # Calculate virtual line positions (will be updated when camera is initialized)
         self.entry_virtual_line_y = None
         self.exit_virtual_line_y = None
@@ -109,25 +152,95 @@ class CameraHandler:
         self.exit_callback: Optional[Callable] = None
         
         # Processing state
-        self.processing = False
+        self._stop_event = threading.Event()
         self.processing_thread = None
+        self.capture_thread = None
+        self.frame_queue = queue.Queue(maxsize=2)  # Latest frames from capture thread
+        self.dropped_frames = 0
+        self.queue_log_interval = 300  # Frames between queue depth log messages
+        self.processing_cpu = 3  # CPU core for the processing thread (None to disable pinning)
         self.last_entry_crossing_time = 0
         self.last_exit_crossing_time = 0
         self.crossing_cooldown = 3.0  # Seconds between crossing detections
         
+        # Crossing callbacks (OCR) run off the processing thread; the worker is
+        # created lazily from the pinned thread, so it restores the startup CPU set
+        self._default_affinity = self._get_affinity()
+        self._ocr_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr",
+                                                initializer=self._restore_affinity)
+        self._ocr_inflight = 0
+        self._ocr_inflight_lock = threading.Lock()
+        self.max_ocr_inflight = 4  # Crossings dropped while this many callbacks are pending
+        
+    def _precompute_zone_geometry(self):
+        """Precompute zone rectangles and frame slices from the zone configuration"""
+        self._entry_rect = (self.entry_zone["x1"], self.entry_zone["y1"],
+                            self.entry_zone["x2"], self.entry_zone["y2"])
+        self._exit_rect = (self.exit_zone["x1"], self.exit_zone["y1"],
+                           self.exit_zone["x2"], self.exit_zone["y2"])
+        
+        x1, y1, x2, y2 = self._entry_rect
+        self._entry_slice = np.s_[y1:y2, x1:x2]
+        x1, y1, x2, y2 = self._exit_rect
+        self._exit_slice = np.s_[y1:y2, x1:x2]
+    
+    @staticmethod
+    def _cuda_available() -> bool:
+        """Check whether OpenCV can use a CUDA device"""
+        try:
+            return cv2.cuda.getCudaEnabledDeviceCount() > 0
+        except (AttributeError, cv2.error):
+            return False
+    
+    def _apply_background_subtraction(self, frame: np.ndarray,
+                                      learning_rate: float = -1) -> np.ndarray:
+        """
+        Update the background model with a frame
+        
+        Args:
+            frame: Camera frame
+            learning_rate: MOG2 learning rate (-1 for automatic)
+        
+        Returns:
+            numpy.ndarray: Foreground mask
+        """
+        if not self.use_cuda:
+            return self.background_subtractor.apply(frame, learningRate=learning_rate)
+        
+        self.gpu_frame.upload(frame, self.stream)
+        self.bg_sub_gpu.apply(self.gpu_frame, learning_rate, self.stream, self.gpu_mask)
+        fg_mask = self.gpu_mask.download(self.stream)
+        self.stream.waitForCompletion()
+        return fg_mask
+    
+    def _downscale(self, frame: np.ndarray) -> np.ndarray:
+        """Resize frame to the background subtraction resolution"""
+        return cv2.resize(frame, (self.proc_width, self.proc_height),
+                          interpolation=cv2.INTER_AREA)
+    
     def initialize_camera(self):
         """Initialize camera"""
         try:
-            self.camera = cv2.VideoCapture(self.camera_index)
+            # Prefer V4L2 directly, fall back to OpenCV's default backend
+            self.camera = cv2.VideoCapture(self.camera_index, cv2.CAP_V4L2)
+            if not self.camera.isOpened():
+                self.camera = cv2.VideoCapture(self.camera_index)
             if not self.camera.isOpened():
                 raise Exception(f"Failed to open camera at index {self.camera_index}")
             
             # Set camera properties
+            # MJPG avoids the USB bandwidth limit of raw YUYV at 720p
+            self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
             self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
             self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
             self.camera.set(cv2.CAP_PROP_AUTOFOCUS, 1)
+            # Only keep the latest frame in the driver queue
+            self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
-            logger.info(f"Camera initialized at index {self.camera_index}")
+            fourcc = int(self.camera.get(cv2.CAP_PROP_FOURCC))
+            fourcc_str = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+            logger.info(f"Camera initialized at index {self.camera_index} "
+                        f"(backend: {self.camera.getBackendName()}, format: {fourcc_str})")
             
             # Get actual frame dimensions (may differ from requested)
             ret, test_frame = self.camera.read()
@@ -137,17 +250,26 @@ class CameraHandler:
                 self.entry_virtual_line_y = int(actual_height * self.entry_virtual_line_position)
                 self.exit_virtual_line_y = int(actual_height * self.exit_virtual_line_position)
                 logger.info(f"Frame dimensions: {actual_width}x{actual_height}")
+                # Keep the processing resolution at the frame's aspect ratio
+                self.proc_width = min(self.proc_width, actual_width)
+                self.proc_height = int(actual_height * self.proc_width / actual_width)
+                self.scale_x = actual_width / self.proc_width
+                self.scale_y = actual_height / self.proc_height
+                logger.info(f"Processing resolution: {self.proc_width}x{self.proc_height}")
                 logger.info(f"Entry zone: ({self.entry_zone['x1']}, {self.entry_zone['y1']}) to ({self.entry_zone['x2']}, {self.entry_zone['y2']})")
                 logger.info(f"Exit zone: ({self.exit_zone['x1']}, {self.exit_zone['y1']}) to ({self.exit_zone['x2']}, {self.exit_zone['y2']})")
                 logger.info(f"Entry virtual line at y={self.entry_virtual_line_y} (ratio={self.entry_virtual_line_position})")
                 logger.info(f"Exit virtual line at y={self.exit_virtual_line_y} (ratio={self.exit_virtual_line_position})")
             
             # Allow camera to stabilize and learn background
-            logger.info("Learning background (5 seconds)...")
-            for _ in range(150):  # ~5 seconds at 30fps
+            # A fixed high learning rate lets the model converge in fewer frames
+            logger.info("Learning background (2 seconds)...")
+            for _ in range(self.background_learning_frames):
                 ret, frame = self.camera.read()
                 if ret:
-                    self.background_subtractor.apply(frame)
+                    self._apply_background_subtraction(
+                        self._downscale(frame), self.background_learning_rate
+                    )
             logger.info("Background learning complete")
             
             return True
@@ -166,6 +288,9 @@ class CameraHandler:
                           Callback receives (frame, zone_image) as arguments
             exit_callback: Function to call when exit virtual line is crossed
                           Callback receives (frame, zone_image) as arguments
+        
+        zone_image is a view into frame. Callbacks that keep either image
+        beyond the call (e.g. queue it for later processing) must copy it.
         """
         if self.camera is None or not self.camera.isOpened():
             logger.error("Camera not initialized")
@@ -173,7 +298,10 @@ class CameraHandler:
         
         self.entry_callback = entry_callback
         self.exit_callback = exit_callback
-        self.processing = True
+        self._stop_event.clear()
+        
+        self.capture_thread = threading.Thread(target=self._capture_frames, daemon=True)
+        self.capture_thread.start()
         
         self.processing_thread = threading.Thread(target=self._process_frames, daemon=True)
         self.processing_thread.start()
@@ -183,108 +311,232 @@ class CameraHandler:
     
     def stop_processing(self):
         """Stop continuous frame processing"""
-        self.processing = False
+        self._stop_event.set()
+        
+        # Wake the processing thread if it is waiting for a frame
+        try:
+            self.frame_queue.put_nowait(None)
+        except queue.Full:
+            pass
+        
+        if self.capture_thread:
+            self.capture_thread.join(timeout=2.0)
         if self.processing_thread:
             self.processing_thread.join(timeout=2.0)
         logger.info("Frame processing stopped")
     
-    def _process_frames(self):
-        """Main frame processing loop with virtual line detection"""
-        while self.processing:
+    def _capture_frames(self):
+        """Capture loop feeding the frame queue, dropping the oldest frame when full"""
+        while not self._stop_event.is_set():
             ret, frame = self.camera.read()
             if not ret:
                 logger.warning("Failed to read frame")
-                time.sleep(0.1)
+                if self._stop_event.wait(0.1):
+                    break
                 continue
             
-            # Apply background subtraction
-            fg_mask = self.background_subtractor.apply(frame)
+            try:
+                self.frame_queue.put_nowait(frame)
+            except queue.Full:
+                try:
+                    self.frame_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self.frame_queue.put_nowait(frame)
+                self.dropped_frames += 1
+    
+    def _process_frames(self):
+        """Main frame processing loop with virtual line detection"""
+        self._pin_processing_thread()
+        
+        frame_count = 0
+        idle_frames = 0
+        while not self._stop_event.is_set():
+            try:
+                frame = self.frame_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
             
-            # Process entry zone
-            self._check_virtual_line_crossing(
-                frame, fg_mask, Zone.ENTRY, self.entry_callback
-            )
+            # None is queued by stop_processing to wake this thread
+            if frame is None:
+                continue
             
-            # Process exit zone
-            self._check_virtual_line_crossing(
-                frame, fg_mask, Zone.EXIT, self.exit_callback
-            )
+            frame_count += 1
+            if frame_count % self.queue_log_interval == 0:
+                logger.debug(f"Frame queue depth: {self.frame_queue.qsize()}, "
+                             f"dropped frames: {self.dropped_frames}")
             
-            # Small delay to prevent excessive CPU usage
-            time.sleep(0.033)  # ~30 FPS
+            small_frame = self._downscale(frame)
+            
+            # Skip background subtraction when nothing changed since the last frame,
+            # unless a vehicle was still in view (it may have stopped on the line)
+            moving = self._has_motion(small_frame)
+            if not moving and not self._foreground_active:
+                idle_frames += 1
+                if idle_frames % self.idle_learning_interval == 0:
+                    self._apply_background_subtraction(small_frame)
+                continue
+            
+            # Apply background subtraction on a downsampled frame
+            fg_mask = self._apply_background_subtraction(small_frame)
+            
+            # Check entry and exit virtual lines in a single pass
+            self._check_all_crossings(frame, fg_mask, time.time())
+    
+    def _pin_processing_thread(self):
+        """Pin the calling thread to the configured CPU core (Linux only)"""
+        if self.processing_cpu is None:
+            return
+        
+        try:
+            os.sched_setaffinity(0, {self.processing_cpu})
+            logger.info(f"Frame processing pinned to CPU {self.processing_cpu}")
+        except (AttributeError, OSError) as e:
+            logger.warning(f"Could not pin frame processing to CPU {self.processing_cpu}: {e}")
+    
+    @staticmethod
+    def _get_affinity() -> Optional[set]:
+        """Return the calling thread's CPU set, or None where unsupported"""
+        try:
+            return os.sched_getaffinity(0)
+        except (AttributeError, OSError):
+            return None
     
-    def _check_virtual_line_crossing(self, frame: np.ndarray, fg_mask: np.ndarray,
-                                    zone: Zone, callback: Optional[Callable]):
+    def _restore_affinity(self):
+        """Reset the calling thread to the CPU set captured at startup (Linux only)"""
+        if self._default_affinity is None:
+            return
+        
+        try:
+            os.sched_setaffinity(0, self._default_affinity)
+        except OSError as e:
+            logger.warning(f"Could not restore OCR worker CPU affinity: {e}")
+    
+    def _has_motion(self, frame: np.ndarray) -> bool:
         """
-        Check if vehicle crosses virtual line in specified zone
+        Cheap motion check by differencing against the previous frame
         
         Args:
-            frame: Full camera frame
-            fg_mask: Foreground mask from background subtraction
-            zone: Zone to check (ENTRY or EXIT)
-            callback: Callback function if crossing detected
+            frame: Downsampled camera frame
+        
+        Returns:
+            bool: True if enough pixels changed since the previous frame
         """
-        current_time = time.time()
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray_small = cv2.resize(gray, self.motion_gate_size, interpolation=cv2.INTER_AREA)
+        prev_gray_small = self.prev_gray_small
+        self.prev_gray_small = gray_small
         
-        # Extract zone from frame using configured coordinates
-        if zone == Zone.ENTRY:
-            x1, y1 = self.entry_zone["x1"], self.entry_zone["y1"]
-            x2, y2 = self.entry_zone["x2"], self.entry_zone["y2"]
-            zone_frame = frame[y1:y2, x1:x2]
-            zone_mask = fg_mask[y1:y2, x1:x2]
-            virtual_line_y = self.entry_virtual_line_y
-            last_crossing_time = self.last_entry_crossing_time
-            # Adjust virtual line relative to zone
-            zone_virtual_line_y = virtual_line_y - y1
-        else:  # EXIT
-            x1, y1 = self.exit_zone["x1"], self.exit_zone["y1"]
-            x2, y2 = self.exit_zone["x2"], self.exit_zone["y2"]
-            zone_frame = frame[y1:y2, x1:x2]
-            zone_mask = fg_mask[y1:y2, x1:x2]
-            virtual_line_y = self.exit_virtual_line_y
-            last_crossing_time = self.last_exit_crossing_time
-            # Adjust virtual line relative to zone
-            zone_virtual_line_y = virtual_line_y - y1
-        
-        # Check cooldown period
-        if current_time - last_crossing_time < self.crossing_cooldown:
+        if prev_gray_small is None:
+            return True
+        
+        diff = cv2.absdiff(gray_small, prev_gray_small)
+        _, diff_mask = cv2.threshold(diff, self.motion_gate_diff_threshold, 255, cv2.THRESH_BINARY)
+        return cv2.countNonZero(diff_mask) >= self.motion_gate_min_pixels
+    
+    def _check_all_crossings(self, frame: np.ndarray, fg_mask: np.ndarray,
+                             current_time: float):
+        """
+        Check if vehicles cross the entry or exit virtual lines
+        
+        Foreground blobs are labelled once for the full mask and dispatched to
+        the zone whose column range contains their centroid, so a blob reaching
+        past the zone's top or bottom edge still counts when it spans the line.
+        
+        Args:
+            frame: Full camera frame
+            fg_mask: Foreground mask from background subtraction (processing resolution)
+            current_time: Timestamp of the frame
+        """
+        # Only check zones that are outside their cooldown period
+        active_zones = []
+        if current_time - self.last_entry_crossing_time >= self.crossing_cooldown:
+            active_zones.append((Zone.ENTRY, self._entry_rect, self._entry_slice,
+                                 self.entry_virtual_line_y, self.entry_callback))
+        if current_time - self.last_exit_crossing_time >= self.crossing_cooldown:
+            active_zones.append((Zone.EXIT, self._exit_rect, self._exit_slice,
+                                 self.exit_virtual_line_y, self.exit_callback))
+        
+        # Motion threshold is configured in full-resolution pixels
+        motion_threshold = self.motion_threshold / (self.scale_x * self.scale_y)
+        
+        # Label foreground blobs; stats rows are (x, y, w, h, area), row 0 is background
+        _, _, stats, _ = cv2.connectedComponentsWithStats(fg_mask, 8, cv2.CV_32S)
+        blobs = stats[1:]
+        blobs = blobs[blobs[:, cv2.CC_STAT_AREA] >= motion_threshold]
+        
+        # Keep the motion gate open while a vehicle-sized blob remains in view
+        self._foreground_active = len(blobs) > 0
+        if not active_zones or len(blobs) == 0:
             return
         
-        # Find contours in the zone
-        contours, _ = cv2.findContours(
-            zone_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-        )
+        # Bounding boxes in full-resolution coordinates
+        top = blobs[:, cv2.CC_STAT_TOP] * self.scale_y
+        bottom = top + blobs[:, cv2.CC_STAT_HEIGHT] * self.scale_y
+        center_x = (blobs[:, cv2.CC_STAT_LEFT] + blobs[:, cv2.CC_STAT_WIDTH] / 2) * self.scale_x
+        
+        for zone, (x1, _, x2, _), zone_slice, virtual_line_y, callback in active_zones:
+            # Blobs centred in the zone's columns that cross the virtual line
+            crossing = ((center_x >= x1) & (center_x < x2) &
+                        (top <= virtual_line_y) & (bottom >= virtual_line_y))
+            if crossing.any():
+                self._handle_crossing(frame, zone, zone_slice, callback, current_time)
+    
+    def _handle_crossing(self, frame: np.ndarray, zone: Zone, zone_slice: tuple,
+                         callback: Optional[Callable], current_time: float):
+        """
+        Record a virtual line crossing and notify the callback
         
-        # Check if any contour crosses the virtual line
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area < self.motion_threshold:
-                continue
-            
-            # Get bounding box
-            _, y, _, h = cv2.boundingRect(contour)
-            contour_bottom = y + h
-            contour_top = y
+        Args:
+            frame: Full camera frame
+            zone: Zone where the crossing happened (ENTRY or EXIT)
+            zone_slice: Frame slice of the zone
+            callback: Callback function for the zone
+            current_time: Timestamp of the crossing
+        """
+        # Vehicle detected crossing virtual line
+        logger.info(f"Vehicle detected crossing {zone.value} virtual line")
+        
+        if zone == Zone.ENTRY:
+            self.last_entry_crossing_time = current_time
+        else:
+            self.last_exit_crossing_time = current_time
+        
+        # Hand callback to the OCR worker if provided
+        if callback:
+            with self._ocr_inflight_lock:
+                if self._ocr_inflight >= self.max_ocr_inflight:
+                    logger.warning(f"OCR queue full, dropped {zone.value} crossing")
+                    return
+                self._ocr_inflight += 1
             
-            # Check if contour crosses virtual line (from above or below)
-            # Use zone-relative virtual line position
-            if (contour_top <= zone_virtual_line_y <= contour_bottom):
-                # Vehicle detected crossing virtual line
-                logger.info(f"Vehicle detected crossing {zone.value} virtual line")
-                
-                if zone == Zone.ENTRY:
-                    self.last_entry_crossing_time = current_time
-                else:
-                    self.last_exit_crossing_time = current_time
-                
-                # Call callback if provided
-                if callback:
-                    try:
-                        callback(frame.copy(), zone_frame.copy())
-                    except Exception as e:
-                        logger.error(f"Error in {zone.value} callback: {e}")
-                
-                break
+            zone_frame = frame[zone_slice]
+            try:
+                self._ocr_executor.submit(self._run_callback, zone, callback, frame, zone_frame)
+            except RuntimeError as e:
+                # Executor already shut down
+                logger.error(f"Error in {zone.value} callback: {e}")
+                with self._ocr_inflight_lock:
+                    self._ocr_inflight -= 1
+    
+    def _run_callback(self, zone: Zone, callback: Callable, frame: np.ndarray,
+                      zone_frame: np.ndarray):
+        """
+        Run a crossing callback on the OCR worker
+        
+        Args:
+            zone: Zone where the crossing happened (ENTRY or EXIT)
+            callback: Callback function for the zone
+            frame: Full camera frame
+            zone_frame: Zone image
+        """
+        try:
+            callback(frame, zone_frame)
+        except Exception as e:
+            logger.error(f"Error in {zone.value} callback: {e}")
+        finally:
+            with self._ocr_inflight_lock:
+                self._ocr_inflight -= 1
     
     def capture_frame(self) -> Optional[np.ndarray]:
         """
@@ -322,13 +574,9 @@ class CameraHandler:
         
         try:
             if zone == Zone.ENTRY:
-                x1, y1 = self.entry_zone["x1"], self.entry_zone["y1"]
-                x2, y2 = self.entry_zone["x2"], self.entry_zone["y2"]
-                return frame[y1:y2, x1:x2]
+                return frame[self._entry_slice]
             else:  # EXIT
-                x1, y1 = self.exit_zone["x1"], self.exit_zone["y1"]
-                x2, y2 = self.exit_zone["x2"], self.exit_zone["y2"]
-                return frame[y1:y2, x1:x2]
+                return frame[self._exit_slice]
         except Exception as e:
             logger.error(f"Error extracting {zone.value} zone: {e}")
             return None
@@ -338,19 +586,16 @@ class CameraHandler:
         Preprocess image for better OCR results
         
         Args:
-            image: Input image
+            image: Input image (BGR or grayscale)
         
         Returns:
             numpy.ndarray: Preprocessed image
         """
-        # Convert to grayscale
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = image.copy()
+        # Convert to grayscale (skipped for pre-converted input)
+        gray = self._to_grayscale(image)
         
         # Apply Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+        blurred = cv2.GaussianBlur(gray, self._GAUSS_KERNEL_SIZE, 0)
         
         # Apply adaptive thresholding
         thresh = cv2.adaptiveThreshold(
@@ -358,8 +603,7 @@ class CameraHandler:
         )
         
         # Apply morphological operations to clean up
-        kernel = np.ones((2, 2), np.uint8)
-        cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+        cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, self._MORPH_KERNEL)
         
         return cleaned
     
@@ -368,7 +612,7 @@ class CameraHandler:
         Extract number plate text from image using Google Cloud Vision API
         
         Args:
-            image: Input image containing number plate
+            image: Input image containing number plate (BGR or grayscale)
         
         Returns:
             str: Extracted number plate text, or None if extraction failed
@@ -422,6 +666,13 @@ class CameraHandler:
             logger.error(f"Error extracting number plate: {e}")
             return None
     
+    @staticmethod
+    def _to_grayscale(image: np.ndarray) -> np.ndarray:
+        """Convert BGR image to grayscale, returning grayscale input unchanged"""
+        if len(image.shape) == 3:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return image
+    
     def _clean_number_plate_text(self, text: str) -> str:
         """
         Clean and validate number plate text
@@ -433,7 +684,8 @@ class CameraHandler:
             str: Cleaned number plate text
         """
         # Remove whitespace and special characters
-        cleaned = ''.join(c for c in text.upper() if c.isalnum())
+        ascii_text = text.upper().encode('ascii', 'ignore').decode('ascii')
+        cleaned = ascii_text.translate(self._PLATE_DELETE_TABLE)
         
         # Basic validation: number plate should have reasonable length (3-10 characters)
         if len(cleaned) < 3 or len(cleaned) > 10:
@@ -460,6 +712,8 @@ class CameraHandler:
     def release_camera(self):
         """Release camera resources"""
         self.stop_processing()
+        # Let in-flight crossing callbacks finish before the caller tears down
+        self._ocr_executor.shutdown(wait=True)
         
         if self.camera is not None:
             self.camera.release()
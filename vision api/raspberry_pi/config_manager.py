@@ -6,8 +6,19 @@ Handles loading and saving zone configurations
 import json
 import os
 import logging
+import numpy as np
 from typing import Dict, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:  # Fall back to the hand-written validation loops
+    fastjsonschema = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +45,34 @@ class ConfigManager:
         "motion_threshold": 500
     }
     
+    _ZONE_SCHEMA = {
+        "type": "object",
+        "required": ["x1", "y1", "x2", "y2"],
+        "properties": {k: {"type": "integer"} for k in ("x1", "y1", "x2", "y2")}
+    }
+    _LINE_SCHEMA = {"type": "number", "minimum": 0, "maximum": 1}
+    
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "required": ["entry_zone", "exit_zone", "entry_virtual_line_position", "exit_virtual_line_position"],
+        "properties": {
+            "entry_zone": _ZONE_SCHEMA,
+            "exit_zone": _ZONE_SCHEMA,
+            "entry_virtual_line_position": _LINE_SCHEMA,
+            "exit_virtual_line_position": _LINE_SCHEMA
+        }
+    }
+    
+    # Schema compiled once into a validator function
+    _VALIDATE = staticmethod(fastjsonschema.compile(CONFIG_SCHEMA)) if fastjsonschema is not None else None
+    
+    # Row indices into the zone array
+    ENTRY_ZONE = 0
+    EXIT_ZONE = 1
+    
+    # Loaded configurations shared by all instances, keyed by file path
+    _CACHED: Dict[str, Dict] = {}
+    
     def __init__(self, config_file="config.json"):
         """
         Initialize configuration manager
@@ -45,32 +84,59 @@ class ConfigManager:
         script_dir = os.path.dirname(os.path.abspath(__file__))
         self.config_file = os.path.join(script_dir, config_file)
         self.config = None
+        self._zones = None
+        
+        cached = self._CACHED.get(self.config_file)
+        if cached is not None:
+            self._set_config(cached)
     
     def load_config(self) -> Dict:
         """
-        Load configuration from file
+        Load configuration from file (read once per process)
         
         Returns:
             dict: Configuration dictionary
         """
+        cached = self._CACHED.get(self.config_file)
+        if cached is not None:
+            self._set_config(cached)
+            return self.config
+        
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    self.config = json.load(f)
-                logger.info(f"Configuration loaded from {self.config_file}")
-                return self.config
+            if orjson is not None:
+                with open(self.config_file, 'rb') as f:
+                    config = orjson.loads(f.read())
             else:
-                logger.warning(f"Configuration file not found: {self.config_file}. Using defaults.")
-                self.config = self.DEFAULT_CONFIG.copy()
-                return self.config
+                with open(self.config_file, 'r') as f:
+                    config = json.load(f)
+            logger.info(f"Configuration loaded from {self.config_file}")
+        except FileNotFoundError:
+            logger.warning(f"Configuration file not found: {self.config_file}. Using defaults.")
+            config = self.DEFAULT_CONFIG.copy()
         except json.JSONDecodeError as e:
             logger.error(f"Error parsing configuration file: {e}. Using defaults.")
-            self.config = self.DEFAULT_CONFIG.copy()
-            return self.config
+            config = self.DEFAULT_CONFIG.copy()
         except Exception as e:
             logger.error(f"Error loading configuration: {e}. Using defaults.")
-            self.config = self.DEFAULT_CONFIG.copy()
-            return self.config
+            config = self.DEFAULT_CONFIG.copy()
+        
+        self._CACHED[self.config_file] = config
+        self._set_config(config)
+        return self.config
+    
+    def _set_config(self, config: Dict):
+        """
+        Set the active configuration and rebuild the zone array
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+        # Rows are (x1, y1, x2, y2), indexed by ENTRY_ZONE / EXIT_ZONE
+        self._zones = np.array(
+            [[z["x1"], z["y1"], z["x2"], z["y2"]] for z in (config["entry_zone"], config["exit_zone"])],
+            dtype=np.int32
+        )
     
     def save_config(self, config: Dict) -> bool:
         """
@@ -88,10 +154,17 @@ class ConfigManager:
                 logger.error("Invalid configuration structure")
                 return False
             
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            if orjson is not None:
+                with open(self.config_file, 'wb') as f:
+                    f.write(orjson.dumps(
+                        config, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                    ))
+            else:
+                with open(self.config_file, 'w') as f:
+                    json.dump(config, f, indent=2)
             
-            self.config = config
+            self._CACHED[self.config_file] = config
+            self._set_config(config)
             logger.info(f"Configuration saved to {self.config_file}")
             return True
         except Exception as e:
@@ -108,6 +181,14 @@ class ConfigManager:
         Returns:
             bool: True if valid, False otherwise
         """
+        if self._VALIDATE is not None:
+            try:
+                self._VALIDATE(config)
+                return True
+            except fastjsonschema.JsonSchemaException as e:
+                logger.error(f"Invalid configuration: {e.message}")
+                return False
+        
         required_keys = ["entry_zone", "exit_zone", "entry_virtual_line_position", "exit_virtual_line_position"]
         
         for key in required_keys:
@@ -149,8 +230,7 @@ class ConfigManager:
         if self.config is None:
             self.load_config()
         
-        zone = self.config["entry_zone"]
-        return (zone["x1"], zone["y1"], zone["x2"], zone["y2"])
+        return tuple(self._zones[self.ENTRY_ZONE].tolist())
     
     def get_exit_zone(self) -> Tuple[int, int, int, int]:
         """
@@ -162,8 +242,24 @@ class ConfigManager:
         if self.config is None:
             self.load_config()
         
-        zone = self.config["exit_zone"]
-        return (zone["x1"], zone["y1"], zone["x2"], zone["y2"])
+        return tuple(self._zones[self.EXIT_ZONE].tolist())
+    
+    def points_in_zone(self, pts: np.ndarray, idx: int) -> np.ndarray:
+        """
+        Test which points lie inside a zone (edges inclusive)
+        
+        Args:
+            pts: Array of shape (N, 2) holding (x, y) points
+            idx: Zone index (ENTRY_ZONE or EXIT_ZONE)
+        
+        Returns:
+            np.ndarray: Boolean array of shape (N,)
+        """
+        if self.config is None:
+            self.load_config()
+        
+        z = self._zones[idx]
+        return (pts[:, 0] >= z[0]) & (pts[:, 0] <= z[2]) & (pts[:, 1] >= z[1]) & (pts[:, 1] <= z[3])
     
     def get_entry_virtual_line_position(self) -> float:
         """
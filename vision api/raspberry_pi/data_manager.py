@@ -1,14 +1,26 @@
 """
 Data Manager Module
 Handles JSON file operations for vehicle records and parking history
+
+Changes are appended to JSON-Lines logs next to the JSON files and folded
+back into the JSON files periodically and on close().
 """
 
+import hashlib
 import json
 import os
+import threading
+from collections import Counter
+from itertools import chain, islice
 from datetime import datetime
 from typing import Optional, Dict, List
 import logging
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,28 +39,82 @@ class DataManager:
         self.data_dir = data_dir
         self.vehicles_file = os.path.join(data_dir, vehicles_file)
         self.history_file = os.path.join(data_dir, history_file)
+        self.vehicles_log_file = self.vehicles_file + ".log"
+        self.history_log_file = self.history_file + ".log"
+        self.history_compacting_file = self.history_log_file + ".compacting"
+        
+        # Logged operations between compactions into the JSON files
+        self.compact_interval = 100
+        self._pending_ops = 0
+        self._lock = threading.RLock()
+        
+        # Parsed JSON files keyed by path, valid while (mtime, size) is unchanged
+        self._json_cache = {}
+        
+        # Last bytes written to each JSON file, used to skip identical rewrites
+        self._last_written = {}
         
         # Ensure data directory exists
         os.makedirs(data_dir, exist_ok=True)
         
         # Initialize files if they don't exist
         self._initialize_files()
+        
+        # Finish a history merge interrupted by a crash
+        if os.path.exists(self.history_compacting_file):
+            self._merge_history_log()
+        
+        # Active vehicles keyed by number plate, and how many of them hold each slot
+        self._legacy_format = False
+        self._active = self._load_active_vehicles()
+        self._occupied = Counter(v["slot"] for v in self._active.values() if v.get("slot") is not None)
+        
+        # Rewrite list-form vehicle files in the plate-keyed layout
+        if self._legacy_format:
+            logger.info(f"Migrating {self.vehicles_file} to plate-keyed format")
+            self.compact()
     
     def _initialize_files(self):
         """Initialize JSON files if they don't exist"""
-        if not os.path.exists(self.vehicles_file):
-            self._write_json(self.vehicles_file, {"vehicles": []})
-            logger.info(f"Initialized {self.vehicles_file}")
-        
-        if not os.path.exists(self.history_file):
-            self._write_json(self.history_file, {"history": []})
-            logger.info(f"Initialized {self.history_file}")
+        self._create_json(self.vehicles_file, {"vehicles": {}, "occupied_slots": []})
+        self._create_json(self.history_file, {"history": []})
+    
+    def _create_json(self, filepath: str, data: dict):
+        """Create JSON file, leaving an existing file untouched"""
+        try:
+            with open(filepath, 'xb') as f:
+                if orjson is not None:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                else:
+                    f.write(json.dumps(data, indent=2).encode('utf-8'))
+            logger.info(f"Initialized {filepath}")
+        except FileExistsError:
+            pass
+        except Exception as e:
+            logger.error(f"Error initializing {filepath}: {e}")
     
     def _read_json(self, filepath: str) -> dict:
-        """Read JSON file"""
+        """
+        Read JSON file, reusing the parsed data while the file is unchanged
+        
+        The returned dict is shared with the cache and must not be modified.
+        """
         try:
-            with open(filepath, 'r') as f:
-                return json.load(f)
+            st = os.stat(filepath)
+            key = (st.st_mtime_ns, st.st_size)
+            cached = self._json_cache.get(filepath)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            
+            if orjson is not None:
+                with open(filepath, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(filepath, 'r') as f:
+                    data = json.load(f)
+            
+            self._json_cache[filepath] = (key, data)
+            return data
         except FileNotFoundError:
             logger.warning(f"File not found: {filepath}")
             return {}
@@ -56,13 +122,204 @@ class DataManager:
             logger.error(f"JSON decode error in {filepath}: {e}")
             return {}
     
-    def _write_json(self, filepath: str, data: dict):
-        """Write JSON file"""
+    def _write_json(self, filepath: str, data: dict, durable: bool = False) -> bool:
+        """
+        Write JSON file atomically via a temporary file and os.replace
+        
+        Non-durable writes are skipped when the serialized data matches the
+        last write.
+        
+        Args:
+            filepath: Destination path
+            data: Data to write
+            durable: fsync the file before replacing (default: False)
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        tmp_path = filepath + ".tmp"
         try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            if orjson is not None:
+                payload = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(data, indent=2, default=str).encode('utf-8')
+            
+            # Durable writes always go to disk so the fsync is not skipped
+            if not durable and payload == self._last_written.get(filepath):
+                return True
+            
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+            self._last_written[filepath] = payload
+            
+            st = os.stat(filepath)
+            self._json_cache[filepath] = ((st.st_mtime_ns, st.st_size), data)
+            return True
         except Exception as e:
             logger.error(f"Error writing to {filepath}: {e}")
+            return False
+    
+    def _append_log(self, filepath: str, record: dict):
+        """Append a record to a JSON-Lines log file"""
+        if orjson is not None:
+            line = orjson.dumps(record, default=str)
+        else:
+            line = json.dumps(record, default=str).encode('utf-8')
+        
+        with open(filepath, 'ab') as f:
+            f.write(line + b"\n")
+    
+    def _read_log(self, filepath: str) -> List[Dict]:
+        """Read all records from a JSON-Lines log file"""
+        try:
+            with open(filepath, 'rb') as f:
+                return self._parse_log(f.read(), filepath)
+        except FileNotFoundError:
+            return []
+    
+    @staticmethod
+    def _parse_log(raw: bytes, filepath: str) -> List[Dict]:
+        """Parse JSON-Lines log content read from filepath"""
+        records = []
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(orjson.loads(line) if orjson is not None else json.loads(line))
+            except json.JSONDecodeError:
+                # A crash mid-append can leave a truncated last line
+                logger.warning(f"Skipping corrupt line in {filepath}")
+        return records
+    
+    def _load_active_vehicles(self) -> Dict[str, Dict]:
+        """
+        Load active vehicles from the JSON file and replay the change log
+        
+        Entry times are parsed into datetime objects once here.
+        """
+        data = self._read_json(self.vehicles_file)
+        vehicles = data.get("vehicles", {})
+        if isinstance(vehicles, list):
+            # Older files store a list of vehicle records
+            vehicles = {v["number_plate"]: v for v in vehicles}
+            self._legacy_format = True
+        active = {plate: {**v, "number_plate": plate} for plate, v in vehicles.items()}
+        
+        log_records = self._read_log(self.vehicles_log_file)
+        for record in log_records:
+            if record.get("op") == "add":
+                vehicle = record["vehicle"]
+                active[vehicle["number_plate"]] = vehicle
+            elif record.get("op") == "del":
+                active.pop(record["number_plate"], None)
+        
+        for vehicle in active.values():
+            vehicle["entry_time"] = datetime.fromisoformat(vehicle["entry_time"])
+        
+        self._pending_ops = len(log_records)
+        return active
+    
+    @staticmethod
+    def _serialize_vehicle(vehicle: Dict) -> Dict:
+        """Convert an in-memory vehicle record to its JSON form"""
+        return {**vehicle, "entry_time": vehicle["entry_time"].isoformat()}
+    
+    def _vehicles_document(self) -> Dict:
+        """
+        Build the vehicles.json content
+        
+        Returns:
+            dict: {"vehicles": {plate: {entry_time, slot}}, "occupied_slots": [...]}.
+                occupied_slots is derived from the vehicles for readers of the
+                file; it is not read back on load.
+        """
+        vehicles = {}
+        for plate, vehicle in self._active.items():
+            record = self._serialize_vehicle(vehicle)
+            del record["number_plate"]
+            vehicles[plate] = record
+        return {"vehicles": vehicles, "occupied_slots": sorted(self._occupied)}
+    
+    def _record_op(self):
+        """Count a logged operation and compact when the interval is reached"""
+        self._pending_ops += 1
+        if self._pending_ops >= self.compact_interval:
+            self.compact()
+    
+    def compact(self, durable: bool = False) -> bool:
+        """
+        Fold the change logs back into the JSON files
+        
+        Args:
+            durable: fsync the JSON files before replacing them (default: False)
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        with self._lock:
+            if not self._write_json(self.vehicles_file, self._vehicles_document(), durable):
+                return False
+            self._remove_file(self.vehicles_log_file)
+            
+            if not self._merge_history_log(durable):
+                return False
+            
+            self._pending_ops = 0
+            logger.debug("Compacted data files")
+            return True
+    
+    def _merge_history_log(self, durable: bool = False) -> bool:
+        """
+        Fold the history log into the history file
+        
+        History records are not idempotent, so the log is renamed aside before
+        merging and the digest of the merged batch is stored in the history
+        file. A crash between replacing the history file and removing the
+        renamed log then cannot replay the batch twice.
+        
+        Args:
+            durable: fsync the history file before replacing it (default: False)
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        with self._lock:
+            # Resume a batch left over from an interrupted merge before taking a new one
+            if not os.path.exists(self.history_compacting_file):
+                try:
+                    os.replace(self.history_log_file, self.history_compacting_file)
+                except FileNotFoundError:
+                    return True
+            
+            with open(self.history_compacting_file, 'rb') as f:
+                raw = f.read()
+            digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+            
+            data = self._read_json(self.history_file)
+            history_records = self._parse_log(raw, self.history_compacting_file)
+            if history_records and data.get("merged_log") != digest:
+                data = {**data, "history": data.get("history", []) + history_records,
+                        "merged_log": digest}
+                if not self._write_json(self.history_file, data, durable):
+                    return False
+            
+            self._remove_file(self.history_compacting_file)
+            return True
+    
+    def close(self):
+        """Compact data files on shutdown and sync them to disk"""
+        self.compact(durable=True)
+    
+    def _remove_file(self, filepath: str):
+        """Remove file if it exists"""
+        try:
+            os.remove(filepath)
+        except FileNotFoundError:
+            pass
     
     def add_vehicle_entry(self, number_plate: str, entry_time: datetime, slot: int = 1) -> bool:
         """
@@ -77,25 +334,25 @@ class DataManager:
             bool: True if successful, False otherwise
         """
         try:
-            data = self._read_json(self.vehicles_file)
-            vehicles = data.get("vehicles", [])
-            
-            # Check if vehicle already exists (shouldn't happen, but safety check)
-            for vehicle in vehicles:
-                if vehicle.get("number_plate") == number_plate:
+            with self._lock:
+                # Check if vehicle already exists (shouldn't happen, but safety check)
+                if number_plate in self._active:
                     logger.warning(f"Vehicle {number_plate} already in system")
                     return False
-            
-            # Add new vehicle entry
-            vehicle_entry = {
-                "number_plate": number_plate,
-                "entry_time": entry_time.isoformat(),
-                "slot": slot
-            }
-            
-            vehicles.append(vehicle_entry)
-            data["vehicles"] = vehicles
-            self._write_json(self.vehicles_file, data)
+                
+                # Add new vehicle entry
+                vehicle_entry = {
+                    "number_plate": number_plate,
+                    "entry_time": entry_time,
+                    "slot": slot
+                }
+                
+                self._append_log(self.vehicles_log_file,
+                                 {"op": "add", "vehicle": self._serialize_vehicle(vehicle_entry)})
+                self._active[number_plate] = vehicle_entry
+                if slot is not None:
+                    self._occupied[slot] += 1
+                self._record_op()
             
             logger.info(f"Added vehicle entry: {number_plate} at slot {slot}")
             return True
@@ -115,18 +372,12 @@ class DataManager:
             dict: Vehicle entry record, or None if not found
         """
         try:
-            data = self._read_json(self.vehicles_file)
-            vehicles = data.get("vehicles", [])
-            
-            for vehicle in vehicles:
-                if vehicle.get("number_plate") == number_plate:
-                    # Convert ISO format string back to datetime
-                    entry_time_str = vehicle.get("entry_time")
-                    vehicle_copy = vehicle.copy()
-                    vehicle_copy["entry_time"] = datetime.fromisoformat(entry_time_str)
-                    return vehicle_copy
+            vehicle = self._active.get(number_plate)
+            if vehicle is None:
+                return None
             
-            return None
+            # Entry time is already a datetime
+            return vehicle.copy()
             
         except Exception as e:
             logger.error(f"Error getting vehicle entry: {e}")
@@ -143,21 +394,18 @@ class DataManager:
             bool: True if successful, False otherwise
         """
         try:
-            data = self._read_json(self.vehicles_file)
-            vehicles = data.get("vehicles", [])
-            
-            # Find and remove vehicle
-            original_count = len(vehicles)
-            vehicles = [v for v in vehicles if v.get("number_plate") != number_plate]
+            with self._lock:
+                if number_plate not in self._active:
+                    logger.warning(f"Vehicle {number_plate} not found in active records")
+                    return False
+                
+                self._append_log(self.vehicles_log_file, {"op": "del", "number_plate": number_plate})
+                vehicle = self._active.pop(number_plate)
+                self._release_slot(vehicle.get("slot"))
+                self._record_op()
             
-            if len(vehicles) < original_count:
-                data["vehicles"] = vehicles
-                self._write_json(self.vehicles_file, data)
-                logger.info(f"Removed vehicle entry: {number_plate}")
-                return True
-            else:
-                logger.warning(f"Vehicle {number_plate} not found in active records")
-                return False
+            logger.info(f"Removed vehicle entry: {number_plate}")
+            return True
                 
         except Exception as e:
             logger.error(f"Error removing vehicle entry: {e}")
@@ -179,9 +427,6 @@ class DataManager:
             bool: True if successful, False otherwise
         """
         try:
-            data = self._read_json(self.history_file)
-            history = data.get("history", [])
-            
             # Add history record
             history_entry = {
                 "number_plate": number_plate,
@@ -191,9 +436,9 @@ class DataManager:
                 "slot": slot
             }
             
-            history.append(history_entry)
-            data["history"] = history
-            self._write_json(self.history_file, data)
+            with self._lock:
+                self._append_log(self.history_log_file, history_entry)
+                self._record_op()
             
             logger.info(f"Added history record: {number_plate}, Fee: ${fee:.2f}")
             return True
@@ -207,21 +452,12 @@ class DataManager:
         Get all active vehicle entries
         
         Returns:
-            list: List of active vehicle records
+            list: List of active vehicle records. The records are the manager's
+                own dicts and must not be modified.
         """
         try:
-            data = self._read_json(self.vehicles_file)
-            vehicles = data.get("vehicles", [])
-            
-            # Convert ISO format strings back to datetime
-            result = []
-            for vehicle in vehicles:
-                vehicle_copy = vehicle.copy()
-                entry_time_str = vehicle.get("entry_time")
-                vehicle_copy["entry_time"] = datetime.fromisoformat(entry_time_str)
-                result.append(vehicle_copy)
-            
-            return result
+            # Entry times are already datetime objects
+            return list(self._active.values())
             
         except Exception as e:
             logger.error(f"Error getting active vehicles: {e}")
@@ -238,23 +474,24 @@ class DataManager:
             list: List of history records
         """
         try:
-            data = self._read_json(self.history_file)
-            history = data.get("history", [])
+            with self._lock:
+                data = self._read_json(self.history_file)
+                history = data.get("history", [])
+                log_records = self._read_log(self.history_log_file)
+            
+            # Walk most recent first (log, then file), stopping after limit records
+            records = chain(reversed(log_records), reversed(history))
+            if limit is not None:
+                records = islice(records, limit)
             
             # Convert ISO format strings back to datetime
             result = []
-            for record in history:
+            for record in records:
                 record_copy = record.copy()
                 record_copy["entry_time"] = datetime.fromisoformat(record.get("entry_time"))
                 record_copy["exit_time"] = datetime.fromisoformat(record.get("exit_time"))
                 result.append(record_copy)
             
-            # Return most recent first
-            result.reverse()
-            
-            if limit is not None:
-                result = result[:limit]
-            
             return result
             
         except Exception as e:
@@ -272,21 +509,40 @@ class DataManager:
             list: List of available slot numbers (1-indexed)
         """
         try:
-            data = self._read_json(self.vehicles_file)
-            vehicles = data.get("vehicles", [])
+            occupied_slots = self._occupied_slots()
             
-            # Get occupied slots
-            occupied_slots = {v.get("slot") for v in vehicles if v.get("slot") is not None}
+            # Single-slot deployments only need one membership test
+            if total_slots == 1:
+                return [] if 1 in occupied_slots else [1]
             
             # Find available slots
-            available = [i for i in range(1, total_slots + 1) if i not in occupied_slots]
-            
-            return available
+            return sorted(set(range(1, total_slots + 1)).difference(occupied_slots))
             
         except Exception as e:
             logger.error(f"Error getting available slots: {e}")
             return list(range(1, total_slots + 1))
     
+    def _release_slot(self, slot: Optional[int]):
+        """Drop one holder of a slot, freeing it when no active vehicle remains"""
+        if slot is None or slot not in self._occupied:
+            return
+        self._occupied[slot] -= 1
+        if self._occupied[slot] <= 0:
+            del self._occupied[slot]
+    
+    def _occupied_slots(self):
+        """Get the slots held by active vehicles"""
+        return self._occupied.keys()
+    
+    def count_occupied(self) -> int:
+        """
+        Get the number of occupied parking slots
+        
+        Returns:
+            int: Number of slots held by active vehicles
+        """
+        return len(self._occupied)
+    
     def is_parking_full(self, total_slots: int = 1) -> bool:
         """
         Check if parking is full
@@ -297,6 +553,5 @@ class DataManager:
         Returns:
             bool: True if parking is full, False otherwise
         """
-        available_slots = self.get_available_slots(total_slots)
-        return len(available_slots) == 0
+        return self.count_occupied() >= total_slots
 
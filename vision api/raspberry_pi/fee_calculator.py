@@ -8,6 +8,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_ONE_HOUR = timedelta(hours=1)
+
 
 class FeeCalculator:
     """Calculates parking fees"""
@@ -43,30 +45,14 @@ class FeeCalculator:
         # Calculate parking duration
         duration = exit_time - entry_time
         
-        # Convert duration to hours (including fractional hours)
-        hours = duration.total_seconds() / 3600.0
-        
-        # Calculate fee (round up to nearest hour)
-        hours_rounded = self._round_up_hours(hours)
+        # Calculate fee (round up to nearest hour, exact integer ceiling)
+        hours_rounded = -(-duration // _ONE_HOUR)
         fee = hours_rounded * self.hourly_rate
         
-        logger.info(f"Parking duration: {duration}, Hours: {hours:.2f}, Fee: ${fee:.2f}")
+        logger.info(f"Parking duration: {duration}, Billed hours: {hours_rounded}, Fee: ${fee:.2f}")
         
         return fee
     
-    def _round_up_hours(self, hours: float) -> float:
-        """
-        Round up hours to nearest hour
-        
-        Args:
-            hours: Hours as float
-        
-        Returns:
-            float: Rounded up hours
-        """
-        import math
-        return math.ceil(hours)
-    
     def format_fee(self, fee: float) -> str:
         """
         Format fee as currency string
@@ -99,9 +85,8 @@ class FeeCalculator:
         duration = exit_time - entry_time
         total_seconds = int(duration.total_seconds())
         
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
+        hours, rem = divmod(total_seconds, 3600)
+        minutes, seconds = divmod(rem, 60)
         
         if hours > 0:
             if minutes > 0: